@@ -4,10 +4,63 @@ This module handles the generation of audio files from text using
 ElevenLabs' text-to-speech API.
 """
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import requests
+from tenacity import (
+    AsyncRetrying,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential,
+)
 from tqdm import tqdm
-from elevenlabs import generate, save, set_api_key
-from src.utils.config import Config
+from src.utils.api_cache import get_api_cache
+from src.utils.config import get_config
+from src.utils.output_cache import (
+    atomic_output,
+    copy_output,
+    is_up_to_date,
+    record_params,
+)
+from src.utils.rate_limiter import TokenBucket
+
+# ElevenLabs error statuses worth retrying, along with 5xx HTTP statuses;
+# anything else (exhausted quota, bad key, invalid voice) fails the same
+# way on every attempt
+TRANSIENT_STATUSES = {"too_many_concurrent_requests", "system_busy"}
+
+
+def _is_transient(error: BaseException) -> bool:
+    """Check whether a failed ElevenLabs call is worth retrying.
+    
+    Server errors without a JSON body reach us either as an APIError
+    carrying the bare HTTP status or as a JSON decoding error.
+    
+    Args:
+        error (BaseException): Exception raised by the call
+    
+    Returns:
+        bool: True for busy/concurrency errors, server errors and
+            connection failures
+    """
+    from elevenlabs.api.error import (
+        APIError,
+        AuthorizationError,
+        RateLimitError,
+    )
+    
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(error, (RateLimitError, AuthorizationError)):
+        return False
+    if isinstance(error, APIError):
+        status = str(getattr(error, "status", ""))
+        return status in TRANSIENT_STATUSES or (
+            status.isdigit() and 500 <= int(status) < 600
+        )
+    # Includes json.JSONDecodeError from an HTML error page
+    return isinstance(error, ValueError)
 
 
 class AudioGenerator:
@@ -21,47 +74,223 @@ class AudioGenerator:
     """
     
     def __init__(self, api_key: str):
-        self.config = Config()
+        self.config = get_config()
         self.output_dir = Path(self.config.directories['audio'])
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.api_cache = get_api_cache()
+        # Imported lazily to keep module import cheap
+        from elevenlabs import set_api_key
         set_api_key(api_key)
     
-    def generate(self, text: str, index: int) -> Path:
+    def _audio_path(self, index: int) -> Path:
+        """Get the output path for a paragraph's audio.
+        
+        Args:
+            index (int): Paragraph index
+        
+        Returns:
+            Path: Path to the audio file
+        """
+        return self.output_dir / f"scene{index}.mp3"
+    
+    def _request_params(self, text: str) -> dict:
+        """Get the ElevenLabs request parameters for a paragraph.
+        
+        Args:
+            text (str): Text to generate audio for
+        
+        Returns:
+            dict: Keyword arguments for generate()
+        """
+        return {
+            "text": text,
+            "voice": self.config.elevenlabs['default_voice'],
+            "model": self.config.elevenlabs['model'],
+        }
+    
+    def _is_cached(self, text: str, index: int) -> bool:
+        """Check whether a paragraph's audio is available without the API.
+        
+        Audio is available if the output file is current, or if the same
+        request was made before, in which case the cached response is
+        written to the output file.
+        
+        Args:
+            text (str): Text to generate audio for
+            index (int): Paragraph index for file naming
+        
+        Returns:
+            bool: True if the audio file can be used as is
+        """
+        audio_path = self._audio_path(index)
+        params = self._request_params(text)
+        if is_up_to_date(audio_path, params):
+            return True
+        if self.api_cache.restore(params, audio_path):
+            record_params(audio_path, params)
+            return True
+        return False
+    
+    def generate(self, text: str, index: int, force: bool = False) -> Path:
         """Generate audio for a single paragraph.
         
+        Existing audio generated from the same text, voice and model is
+        reused unless force is set.
+        
         Args:
             text (str): Text to generate audio for
             index (int): Paragraph index for file naming
+            force (bool, optional): Regenerate even if audio already exists
         
         Returns:
             Path: Path to the generated audio file
         """
-        audio = generate(
-            text=text,
-            voice=self.config.elevenlabs['default_voice'],
-            model=self.config.elevenlabs['model']
-        )
+        audio_path = self._audio_path(index)
+        if not force and self._is_cached(text, index):
+            return audio_path
         
-        audio_path = self.output_dir / f"scene{index}.mp3"
-        save(audio, str(audio_path))
+        from elevenlabs import generate, save
+        
+        params = self._request_params(text)
+        audio = generate(**params)
+        with atomic_output(audio_path) as temp_path:
+            save(audio, str(temp_path))
+        record_params(audio_path, params)
+        self.api_cache.store(params, audio_path)
         
         return audio_path
     
-    def batch_generate(self, paragraphs: list[str]) -> list[Path]:
-        """Generate audio for multiple paragraphs.
+    async def _agenerate(
+        self,
+        executor: ThreadPoolExecutor,
+        bucket: TokenBucket,
+        text: str,
+        index: int
+    ) -> Path:
+        """Generate audio for a paragraph without blocking the event loop.
+        
+        The request waits for rate limit capacity first and is retried
+        with exponential backoff if ElevenLabs reports it is busy, returns
+        a server error or the connection fails. Quota and authorization
+        errors fail immediately.
+        
+        Args:
+            executor (ThreadPoolExecutor): Threads for the blocking
+                ElevenLabs calls
+            bucket (TokenBucket): Rate limiter shared by the batch
+            text (str): Text to generate audio for
+            index (int): Paragraph index for file naming
+        
+        Returns:
+            Path: Path to the generated audio file
+        """
+        loop = asyncio.get_running_loop()
+        async for attempt in AsyncRetrying(
+            retry=retry_if_exception(_is_transient),
+            wait=wait_exponential(multiplier=1, max=30),
+            stop=stop_after_attempt(5),
+            reraise=True
+        ):
+            with attempt:
+                # Characters stand in for tokens for text-to-speech
+                await bucket.acquire(len(text))
+                return await loop.run_in_executor(
+                    executor, self.generate, text, index, True
+                )
+    
+    async def abatch_generate(
+        self,
+        paragraphs: list[str],
+        force: bool = False,
+        position: int = 0
+    ) -> list[Path]:
+        """Generate audio for multiple paragraphs concurrently.
+        
+        A semaphore bounds the number of requests in flight, each running
+        on a thread pool of the same size, and a token bucket keeps the
+        request rate under the configured limit. Repeated paragraphs are
+        narrated once and the audio is copied to the other indices. Audio
+        that already exists for a paragraph is reused unless force is set.
+        If a paragraph fails, the others still complete before its error
+        is raised.
+        
+        Args:
+            paragraphs (list[str]): List of text paragraphs
+            force (bool, optional): Regenerate even if audio already exists
+            position (int, optional): Line of the progress bar, so batches
+                running side by side don't overwrite each other
+        
+        Returns:
+            list[Path]: List of paths to generated audio files
+        """
+        tqdm.write("\n🎙️  Generating audio narration...")
+        concurrency = self.config.elevenlabs.get('concurrency', 5)
+        semaphore = asyncio.Semaphore(concurrency)
+        # Dedicated threads, so ElevenLabs calls neither wait for nor
+        # starve the loop's default executor shared with image work
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        bucket = TokenBucket(**self.config.elevenlabs['rate_limit'])
+        progress = tqdm(
+            total=len(paragraphs),
+            desc="Generating audio",
+            unit="paragraph",
+            position=position
+        )
+        
+        indices_by_text = {}
+        for i, text in enumerate(paragraphs):
+            indices_by_text.setdefault(text, []).append(i)
+        audio_paths = [None] * len(paragraphs)
+        
+        async def generate_group(text: str, indices: list[int]):
+            source = None
+            if not force:
+                # Cache checks touch disk, so keep them off the loop
+                for index in indices:
+                    if await asyncio.to_thread(self._is_cached, text, index):
+                        source = self._audio_path(index)
+                        break
+            if source is None:
+                async with semaphore:
+                    source = await self._agenerate(
+                        executor, bucket, text, indices[0]
+                    )
+            
+            params = self._request_params(text)
+            for index in indices:
+                audio_paths[index] = await asyncio.to_thread(
+                    copy_output, source, self._audio_path(index), params
+                )
+            progress.update(len(indices))
+        
+        try:
+            # Let every request finish so completed audio is kept even if
+            # another paragraph fails
+            results = await asyncio.gather(*(
+                generate_group(text, indices)
+                for text, indices in indices_by_text.items()
+            ), return_exceptions=True)
+        finally:
+            progress.close()
+            executor.shutdown(wait=False)
+        
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return audio_paths
+    
+    def batch_generate(
+        self,
+        paragraphs: list[str],
+        force: bool = False
+    ) -> list[Path]:
+        """Generate audio for multiple paragraphs concurrently.
         
         Args:
             paragraphs (list[str]): List of text paragraphs
+            force (bool, optional): Regenerate even if audio already exists
         
         Returns:
             list[Path]: List of paths to generated audio files
         """
-        print("\n🎙️  Generating audio narration...")
-        return [
-            self.generate(text, i) 
-            for i, text in enumerate(tqdm(
-                paragraphs,
-                desc="Generating audio",
-                unit="paragraph"
-            ))
-        ] 
\ No newline at end of file
+        return asyncio.run(self.abatch_generate(paragraphs, force))
\ No newline at end of file
@@ -4,13 +4,73 @@ This module handles the generation of images for text paragraphs using
 OpenAI's DALL-E API, with support for regenerating specific images.
 """
 
+import asyncio
+import logging
 from pathlib import Path
+import shutil
+from typing import TYPE_CHECKING
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+from tenacity import (
+    AsyncRetrying,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential,
+)
 from tqdm import tqdm
-from openai import OpenAI
-from src.utils.config import Config
+from urllib3.util.retry import Retry
+from src.utils.api_cache import get_api_cache
+from src.utils.config import get_config
+from src.utils.output_cache import (
+    atomic_output,
+    copy_output,
+    is_up_to_date,
+    record_params,
+)
+from src.utils.rate_limiter import TokenBucket
 from src.utils.story_processor import StoryProcessor
 
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+logger = logging.getLogger(__name__)
+
+# CDN responses worth retrying when downloading an image
+RETRY_STATUSES = [429, 500, 502, 503, 504]
+
+# Shared session so image downloads reuse connections and retry transient
+# CDN errors
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=RETRY_STATUSES
+    )
+))
+
+# Images a single request may return per model; DALL-E 3 only accepts n=1
+MAX_IMAGES_PER_REQUEST = {
+    "dall-e-2": 10,
+}
+
+
+def _is_retryable_download(error: BaseException) -> bool:
+    """Check whether a failed image download is worth retrying.
+    
+    Args:
+        error (BaseException): Exception raised by the download
+    
+    Returns:
+        bool: True for network errors and transient CDN responses
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRY_STATUSES
+    return isinstance(error, httpx.TransportError)
+
 
 class ImageGenerator:
     """Handles image generation using DALL-E.
@@ -23,20 +83,46 @@ class ImageGenerator:
     """
     
     def __init__(self, api_key: str):
-        self.config = Config()
+        self.config = get_config()
         self.output_dir = Path(self.config.directories['images'])
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.api_key = api_key
+        self.api_cache = get_api_cache()
+        # Imported lazily to keep module import cheap
+        from openai import OpenAI
         self.client = OpenAI(api_key=api_key)
         self.story_processor = StoryProcessor()
         self.current_chapter = None  # Will be set by set_chapter()
+        self._base_prompt = None
     
     def set_chapter(self, chapter_number: int):
-        """Set the current chapter number for base prompt selection.
+        """Set the current chapter number and load its base prompt.
+        
+        The base prompt is read once here and reused for every image in
+        the chapter.
         
         Args:
             chapter_number (int): Chapter number
+        
+        Raises:
+            FileNotFoundError: If base prompt file doesn't exist
         """
+        path = self.story_processor.get_base_prompt_path(chapter_number)
+        logger.debug("Looking for base prompt at: %s", path)
+        
+        file_prompt = self.story_processor.read_base_prompt(chapter_number)
+        if not file_prompt:
+            raise FileNotFoundError(
+                f"Base prompt file not found for chapter {chapter_number}"
+            )
+        
+        logger.debug(
+            "Found base prompt (%d chars):\n---\n%s\n---",
+            len(file_prompt), file_prompt
+        )
+        
         self.current_chapter = chapter_number
+        self._base_prompt = file_prompt
     
     def get_base_prompt(self) -> str:
         """Get the base prompt for the current chapter.
@@ -45,86 +131,332 @@ class ImageGenerator:
             str: Base prompt for image generation
             
         Raises:
-            FileNotFoundError: If base prompt file doesn't exist
             ValueError: If chapter number not set
         """
-        if self.current_chapter is None:
+        if self._base_prompt is None:
             msg = "Chapter number not set. Call set_chapter() first."
             raise ValueError(msg)
-            
-        # Get the path that will be checked
-        path = self.story_processor.get_base_prompt_path(self.current_chapter)
-        print(f"\nLooking for base prompt at: {path}")
         
-        file_prompt = self.story_processor.read_base_prompt(
-            self.current_chapter
-        )
-        if not file_prompt:
-            chapter = self.current_chapter
-            raise FileNotFoundError(
-                f"Base prompt file not found for chapter {chapter}"
-            )
-            
-        print(f"Found base prompt ({len(file_prompt)} chars):")
-        print("---")
-        print(file_prompt)
-        print("---")
+        return self._base_prompt
+    
+    def _build_prompt(self, base_prompt: str, text: str, index: int) -> str:
+        """Combine the chapter base prompt with paragraph context.
+        
+        Args:
+            base_prompt (str): Base prompt for the current chapter
+            text (str): Paragraph text used as context
+            index (int): Paragraph index, used for logging
+        
+        Returns:
+            str: Full prompt for image generation
+        """
+        prompt = f"{base_prompt} Context: {text}"
+        logger.debug("Prompt for image %d:\n---\n%s\n---", index, prompt)
+        return prompt
+    
+    def _image_params(self, prompt: str, n: int = 1) -> dict:
+        """Get DALL-E request parameters for a prompt.
         
-        return file_prompt
+        Args:
+            prompt (str): Full image prompt
+            n (int, optional): Number of images to generate
+        
+        Returns:
+            dict: Keyword arguments for images.generate()
+        """
+        return {
+            "model": self.config.openai['model'],
+            "prompt": prompt,
+            "size": self.config.openai['image_size'],
+            "quality": self.config.openai['quality'],
+            "n": n,
+        }
     
-    def generate(self, text: str, index: int) -> Path:
+    def _max_images_per_request(self) -> int:
+        """Get how many images the configured model returns per request.
+        
+        Returns:
+            int: Maximum value of n for images.generate()
+        """
+        return MAX_IMAGES_PER_REQUEST.get(self.config.openai['model'], 1)
+    
+    def _image_path(self, index: int) -> Path:
+        """Get the output path for a paragraph's image.
+        
+        Args:
+            index (int): Paragraph index
+        
+        Returns:
+            Path: Path to the image file
+        """
+        return self.output_dir / f"image_{index}.png"
+    
+    def _is_cached(self, prompt: str, index: int) -> bool:
+        """Check whether an image for the prompt is available without the API.
+        
+        An image is available if the output file is current, or if the
+        same request was made before, in which case the cached response is
+        written to the output file.
+        
+        Args:
+            prompt (str): Full image prompt
+            index (int): Paragraph index
+        
+        Returns:
+            bool: True if the image file can be used as is
+        """
+        image_path = self._image_path(index)
+        params = self._image_params(prompt)
+        if is_up_to_date(image_path, params):
+            return True
+        if self.api_cache.restore(params, image_path):
+            record_params(image_path, params)
+            return True
+        return False
+    
+    def generate(self, text: str, index: int, force: bool = False) -> Path:
         """Generate image for a single paragraph.
         
+        An existing image generated from the same prompt and settings is
+        reused unless force is set.
+        
         Args:
             text (str): Text to generate image for
             index (int): Paragraph index for file naming
+            force (bool, optional): Regenerate even if the image exists
         
         Returns:
             Path: Path to the generated image file
         """
+        prompt = self._build_prompt(self.get_base_prompt(), text, index)
+        image_path = self._image_path(index)
+        if not force and self._is_cached(prompt, index):
+            return image_path
+        
+        params = self._image_params(prompt)
+        response = self.client.images.generate(**params)
+        image_url = response.data[0].url
+        
+        with _SESSION.get(image_url, stream=True, timeout=30) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            with atomic_output(image_path) as temp_path, \
+                    open(temp_path, "wb") as f:
+                shutil.copyfileobj(response.raw, f, 64 * 1024)
+        record_params(image_path, params)
+        self.api_cache.store(params, image_path)
+        
+        return image_path
+    
+    async def _adownload(self, session: httpx.AsyncClient, url: str) -> bytes:
+        """Download a generated image, retrying transient failures.
+        
+        Rate limit and server error responses from the CDN are retried
+        with exponential backoff, as are dropped connections.
+        
+        Args:
+            session (httpx.AsyncClient): HTTP session shared by the batch
+            url (str): URL of the generated image
+        
+        Returns:
+            bytes: Image data
+        """
+        async for attempt in AsyncRetrying(
+            retry=retry_if_exception(_is_retryable_download),
+            wait=wait_exponential(multiplier=0.5, max=10),
+            stop=stop_after_attempt(4),
+            reraise=True
+        ):
+            with attempt:
+                response = await session.get(url)
+                response.raise_for_status()
+                return response.content
+    
+    def _save_image(self, data: bytes, image_path: Path, params: dict):
+        """Write downloaded image data and record its parameters.
+        
+        Args:
+            data (bytes): Image data
+            image_path (Path): Path to save the image to
+            params (dict): Parameters the image was generated with
+        """
+        with atomic_output(image_path) as temp_path:
+            temp_path.write_bytes(data)
+        record_params(image_path, params)
+    
+    async def _agenerate_batch(
+        self,
+        client: "AsyncOpenAI",
+        session: httpx.AsyncClient,
+        bucket: TokenBucket,
+        prompt: str,
+        indices: list[int]
+    ) -> list[Path]:
+        """Generate and download images for paragraphs sharing a prompt.
+        
+        All images come from a single request with n=len(indices), so
+        indices must not exceed the model's per-request image limit. The
+        request waits for rate limit capacity first; rate limit responses
+        that still occur are retried by the OpenAI client.
+        
+        Args:
+            client (AsyncOpenAI): OpenAI client shared by the batch
+            session (httpx.AsyncClient): HTTP session shared by the batch
+            bucket (TokenBucket): Rate limiter shared by the batch
+            prompt (str): Full image prompt
+            indices (list[int]): Paragraph indices for file naming
+        
+        Returns:
+            list[Path]: Paths to the generated image files, one per index
+        
+        Raises:
+            RuntimeError: If OpenAI returns a different number of images
+                than requested
+        """
+        # Rough token estimate of ~4 characters per token
+        await bucket.acquire(len(prompt) // 4)
+        response = await client.images.generate(
+            **self._image_params(prompt, n=len(indices))
+        )
+        if len(response.data) != len(indices):
+            raise RuntimeError(
+                f"Requested {len(indices)} images for paragraphs {indices} "
+                f"but OpenAI returned {len(response.data)}"
+            )
+        
+        # Disk writes run in threads so they don't stall the event loop
+        params = self._image_params(prompt)
+        image_paths = []
+        for image, index in zip(response.data, indices):
+            image_path = self._image_path(index)
+            data = await self._adownload(session, image.url)
+            await asyncio.to_thread(self._save_image, data, image_path, params)
+            image_paths.append(image_path)
+        
+        # All images share the prompt; cache the first as its response
+        if image_paths:
+            await asyncio.to_thread(
+                self.api_cache.store, params, image_paths[0]
+            )
+        
+        return image_paths
+    
+    async def abatch_generate(
+        self,
+        paragraphs: list[str],
+        force: bool = False,
+        position: int = 0
+    ) -> list[Path]:
+        """Generate images for multiple paragraphs concurrently.
+        
+        A single OpenAI client and HTTP session are shared by all requests
+        so connections are reused, a semaphore bounds the number of
+        requests in flight, and a token bucket keeps the request rate
+        under the configured limit. Paragraphs with identical prompts share
+        one request, which asks for several variations when the model
+        supports n > 1. Images that already exist for a paragraph are
+        reused unless force is set. If a prompt fails, the others still
+        complete before its error is raised.
+        
+        Args:
+            paragraphs (list[str]): List of text paragraphs
+            force (bool, optional): Regenerate even if images already exist
+            position (int, optional): Line of the progress bar, so batches
+                running side by side don't overwrite each other
+        
+        Returns:
+            list[Path]: List of paths to generated image files
+        """
+        tqdm.write("\n🎨 Generating visuals...")
         base_prompt = self.get_base_prompt()
-        prompt = f"{base_prompt} Context: {text}"
         
-        print(f"\nPrompt for image {index}:")
-        print("---")
-        print(prompt)
-        print("---")
-        
-        response = self.client.images.generate(
-            model="dall-e-3",
-            prompt=prompt,
-            size="1792x1024",
-            quality="standard",
-            n=1,
+        # Identical paragraphs share a prompt and are generated only once
+        indices_by_prompt = {}
+        for i, text in enumerate(paragraphs):
+            prompt = self._build_prompt(base_prompt, text, i)
+            indices_by_prompt.setdefault(prompt, []).append(i)
+        max_n = self._max_images_per_request()
+        image_paths = [None] * len(paragraphs)
+        
+        semaphore = asyncio.Semaphore(self.config.openai.get('concurrency', 4))
+        bucket = TokenBucket(**self.config.openai['rate_limit'])
+        progress = tqdm(
+            total=len(paragraphs),
+            desc="Generating images",
+            unit="image",
+            position=position
         )
         
-        image_url = response.data[0].url
-        image_path = self.output_dir / f"image_{index}.png"
+        from openai import AsyncOpenAI
+        
+        client = AsyncOpenAI(
+            api_key=self.api_key,
+            max_retries=self.config.openai.get('max_retries', 2)
+        )
+        session = httpx.AsyncClient(
+            timeout=60,
+            transport=httpx.AsyncHTTPTransport(retries=3)
+        )
         
-        response = requests.get(image_url)
-        with open(image_path, "wb") as f:
-            f.write(response.content)
+        async with client, session:
+            async def generate_group(prompt: str, indices: list[int]):
+                async with semaphore:
+                    sources = []
+                    if not force:
+                        # Cache checks touch disk, so keep them off the loop
+                        for index in indices:
+                            if await asyncio.to_thread(
+                                self._is_cached, prompt, index
+                            ):
+                                sources = [self._image_path(index)]
+                                break
+                    if not sources:
+                        sources = await self._agenerate_batch(
+                            client, session, bucket, prompt,
+                            indices[:max_n]
+                        )
+                
+                # Spread the generated images over the remaining paragraphs
+                params = self._image_params(prompt)
+                for k, index in enumerate(indices):
+                    image_paths[index] = await asyncio.to_thread(
+                        copy_output,
+                        sources[k % len(sources)],
+                        self._image_path(index),
+                        params
+                    )
+                progress.update(len(indices))
+            
+            try:
+                # Let every request finish so images that were already paid
+                # for are kept even if another prompt fails
+                results = await asyncio.gather(*(
+                    generate_group(prompt, indices)
+                    for prompt, indices in indices_by_prompt.items()
+                ), return_exceptions=True)
+            finally:
+                progress.close()
         
-        return image_path
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return image_paths
     
-    def batch_generate(self, paragraphs: list[str]) -> list[Path]:
-        """Generate images for multiple paragraphs.
+    def batch_generate(
+        self,
+        paragraphs: list[str],
+        force: bool = False
+    ) -> list[Path]:
+        """Generate images for multiple paragraphs concurrently.
         
         Args:
             paragraphs (list[str]): List of text paragraphs
+            force (bool, optional): Regenerate even if images already exist
         
         Returns:
             list[Path]: List of paths to generated image files
         """
-        print("\n🎨 Generating visuals...")
-        return [
-            self.generate(text, i)
-            for i, text in enumerate(tqdm(
-                paragraphs,
-                desc="Generating images",
-                unit="image"
-            ))
-        ]
+        return asyncio.run(self.abatch_generate(paragraphs, force))
     
     def regenerate(self, text: str, index: int) -> Path:
         """Regenerate image for a specific paragraph.
@@ -137,4 +469,4 @@ class ImageGenerator:
             Path: Path to the regenerated image file
         """
         print("\n🎨 Regenerating image...")
-        return self.generate(text, index) 
\ No newline at end of file
+        return self.generate(text, index, force=True) 
\ No newline at end of file
@@ -0,0 +1,68 @@
+"""Media generation pipeline.
+
+This module runs audio and image generation for a chapter side by side.
+The two target different providers with separate rate limits, so their
+network waits overlap instead of adding up.
+"""
+
+import asyncio
+from pathlib import Path
+from src.generators.audio_generator import AudioGenerator
+from src.generators.image_generator import ImageGenerator
+
+
+async def agenerate_media(
+    audio_generator: AudioGenerator,
+    image_generator: ImageGenerator,
+    paragraphs: list[str],
+    force: bool = False
+) -> tuple[list[Path], list[Path]]:
+    """Generate audio and images for paragraphs concurrently.
+
+    Args:
+        audio_generator (AudioGenerator): Generator for narration
+        image_generator (ImageGenerator): Generator for visuals, with its
+            chapter already set
+        paragraphs (list[str]): List of text paragraphs
+        force (bool, optional): Regenerate even if outputs already exist
+
+    Returns:
+        tuple[list[Path], list[Path]]: Audio paths and image paths, in
+            paragraph order
+    """
+    # Each batch gets its own progress bar line. A failure in one batch
+    # must not cancel the other, so both run to completion first
+    results = await asyncio.gather(
+        audio_generator.abatch_generate(paragraphs, force, position=0),
+        image_generator.abatch_generate(paragraphs, force, position=1),
+        return_exceptions=True
+    )
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    audio_paths, image_paths = results
+    return audio_paths, image_paths
+
+
+def generate_media(
+    audio_generator: AudioGenerator,
+    image_generator: ImageGenerator,
+    paragraphs: list[str],
+    force: bool = False
+) -> tuple[list[Path], list[Path]]:
+    """Generate audio and images for paragraphs concurrently.
+
+    Args:
+        audio_generator (AudioGenerator): Generator for narration
+        image_generator (ImageGenerator): Generator for visuals, with its
+            chapter already set
+        paragraphs (list[str]): List of text paragraphs
+        force (bool, optional): Regenerate even if outputs already exist
+
+    Returns:
+        tuple[list[Path], list[Path]]: Audio paths and image paths, in
+            paragraph order
+    """
+    return asyncio.run(
+        agenerate_media(audio_generator, image_generator, paragraphs, force)
+    )
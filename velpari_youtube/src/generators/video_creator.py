@@ -1,28 +1,31 @@
-"""Video creation module using MoviePy.
+"""Video creation module using ffmpeg and MoviePy.
 
 This module handles the creation of video clips by combining generated
 images and audio files, and merging them into a final video.
 """
 
 from pathlib import Path
-from tqdm import tqdm
-from moviepy.editor import ImageClip, AudioFileClip, concatenate_videoclips
-from src.utils.config import Config
+from typing import TYPE_CHECKING
+from src.utils.config import get_config
+from src.utils.scene_renderer import render_video
+
+if TYPE_CHECKING:
+    from moviepy.editor import ImageClip
 
 
 class VideoCreator:
-    """Handles video creation using MoviePy.
+    """Handles video creation using ffmpeg and MoviePy.
     
-    This class manages the creation of video clips from image and audio
-    files, and combines them into a final video with proper encoding.
+    This class renders image and audio files into a final video with
+    ffmpeg, and can build individual MoviePy clips for editing.
     """
     
     def __init__(self):
-        self.config = Config()
+        self.config = get_config()
         self.output_dir = Path(self.config.directories['output'])
         self.output_dir.mkdir(exist_ok=True)
     
-    def create_clip(self, image_path: Path, audio_path: Path) -> ImageClip:
+    def create_clip(self, image_path: Path, audio_path: Path) -> "ImageClip":
         """Create a video clip from image and audio files.
         
         Args:
@@ -32,6 +35,9 @@ class VideoCreator:
         Returns:
             ImageClip: Video clip with synchronized audio
         """
+        # Imported lazily: moviepy pulls in numpy, imageio and PIL
+        from moviepy.editor import AudioFileClip, ImageClip
+        
         audio = AudioFileClip(str(audio_path))
         image = ImageClip(str(image_path))
         video = image.set_duration(audio.duration)
@@ -55,44 +61,15 @@ class VideoCreator:
         """
         print("\n🎬 Creating video...")
         
-        # Create clips for each image-audio pair
-        clips = []
-        for img_path, audio_path in tqdm(
-            zip(image_paths, audio_paths),
-            desc="Creating clips",
-            total=len(image_paths)
-        ):
-            # Load audio to get duration
-            audio = AudioFileClip(str(audio_path))
-            
-            # Create image clip with same duration as audio
-            image = ImageClip(str(img_path))
-            image = image.set_duration(audio.duration)
-            
-            # Combine image and audio
-            clip = image.set_audio(audio)
-            clips.append(clip)
-        
-        # Concatenate all clips
-        final = concatenate_videoclips(clips)
-        
         # Get output path
         output_path = Path(self.config.directories['output']) / output_name
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # Write video with high quality settings
-        print("\n💾 Writing final video...")
-        final.write_videofile(
-            str(output_path),
-            fps=self.config.video['fps'],
-            codec=self.config.video['video_codec'],
-            preset=self.config.video['video_preset'],
+        # Encode each image-audio pair and join them with a stream copy
+        return render_video(
+            list(zip(image_paths, audio_paths)),
+            output_path,
+            self.config.video,
             audio_codec=self.config.video['audio_codec'],
-            audio_bitrate=self.config.video['audio_bitrate'],
-            ffmpeg_params=[
-                "-crf", str(self.config.video['video_quality']),
-                "-pix_fmt", self.config.video['pixel_format']
-            ]
-        )
-        
-        return output_path 
\ No newline at end of file
+            audio_bitrate=self.config.video['audio_bitrate']
+        )
\ No newline at end of file
@@ -0,0 +1,62 @@
+"""Content-addressed cache for API responses.
+
+This module stores the audio and image bytes returned by ElevenLabs and
+DALL-E on disk, keyed by a hash of the request parameters, so identical
+requests are served locally instead of calling the API again.
+"""
+
+from functools import lru_cache
+from pathlib import Path
+import diskcache
+from src.utils.config import get_config
+from src.utils.output_cache import atomic_output, params_hash
+
+
+class ApiCache:
+    """Disk-backed cache of generated media keyed by request parameters.
+
+    Args:
+        directory (str): Directory holding the cache database
+    """
+
+    def __init__(self, directory: str):
+        self.cache = diskcache.Cache(
+            directory,
+            eviction_policy="least-recently-used"
+        )
+
+    def restore(self, params: dict, output_path: Path) -> bool:
+        """Write a cached response to the output path, if there is one.
+
+        Args:
+            params (dict): Request parameters
+            output_path (Path): Where the media file should be written
+
+        Returns:
+            bool: True if the response was cached and written
+        """
+        data = self.cache.get(params_hash(params))
+        if data is None:
+            return False
+        with atomic_output(output_path) as temp_path:
+            temp_path.write_bytes(data)
+        return True
+
+    def store(self, params: dict, output_path: Path):
+        """Cache the media file generated for a request.
+
+        Args:
+            params (dict): Request parameters
+            output_path (Path): Path to the generated media file
+        """
+        self.cache.set(params_hash(params), output_path.read_bytes())
+
+
+@lru_cache(maxsize=1)
+def get_api_cache() -> ApiCache:
+    """Get the shared API cache in the configured cache directory.
+
+    Returns:
+        ApiCache: Cache shared by all generators
+    """
+    return ApiCache(get_config().directories['cache'])
@@ -1,37 +1,40 @@
 """Configuration management for the video generator.
 
-This module provides a singleton Config class that manages all configuration
+This module provides a Config class that manages all configuration
 settings for the video generator, including directories, API settings, and
-video parameters.
+video parameters. Use get_config() to get the shared instance, which is
+loaded once per process.
 """
 
+from functools import lru_cache
 from pathlib import Path
 import yaml
 
+try:
+    # libyaml's C loader is much faster than the pure-Python one
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+CONFIG_PATH = Path('config/default.yml')
+
 
 class Config:
-    """Singleton configuration manager.
+    """Configuration manager.
     
     This class loads and provides access to all configuration settings from
-    the YAML config file. It follows the singleton pattern to ensure only
-    one instance exists.
+    the YAML config file.
+    
+    Args:
+        config_path (Path, optional): Path to the YAML config file
     
     Attributes:
         config (dict): The loaded configuration settings
     """
     
-    _instance = None
-    
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
-    
-    def __init__(self):
-        if not hasattr(self, 'config'):
-            config_path = Path('config/default.yml')
-            with open(config_path) as f:
-                self.config = yaml.safe_load(f)
+    def __init__(self, config_path: Path = CONFIG_PATH):
+        with open(config_path) as f:
+            self.config = yaml.load(f, Loader=SafeLoader)
     
     @property
     def directories(self) -> dict:
@@ -81,4 +84,14 @@ class Config:
     def ensure_directories(self):
         """Create all necessary directories if they don't exist."""
         for dir_path in self.directories.values():
-            Path(dir_path).mkdir(parents=True, exist_ok=True) 
\ No newline at end of file
+            Path(dir_path).mkdir(parents=True, exist_ok=True)
+
+
+@lru_cache(maxsize=1)
+def get_config() -> Config:
+    """Get the shared configuration, loading it on first use.
+    
+    Returns:
+        Config: Configuration shared by all modules
+    """
+    return Config()
\ No newline at end of file
@@ -4,12 +4,18 @@ This module provides functionality to combine existing audio and image files
 into videos, with support for both single and batch processing.
 """
 
+from itertools import chain
 from pathlib import Path
-from typing import List, Tuple
+from typing import TYPE_CHECKING, List, Tuple
 import re
-from tqdm import tqdm
-from moviepy.editor import ImageClip, AudioFileClip, concatenate_videoclips
-from src.utils.config import Config
+from src.utils.config import get_config
+from src.utils.scene_renderer import render_video
+
+if TYPE_CHECKING:
+    from moviepy.editor import ImageClip
+
+_NATSORT_RE = re.compile(r'(\d+)')
+IMAGE_PATTERNS = ("*.jpg", "*.jpeg", "*.png")
 
 
 class MediaCombiner:
@@ -28,7 +34,7 @@ class MediaCombiner:
             input_dir (str, optional): Directory containing media files
             output_dir (str, optional): Directory for output videos
         """
-        self.config = Config()
+        self.config = get_config()
         self.input_dir = Path(input_dir) if input_dir else Path("input/media")
         
         # Handle output directory
@@ -40,17 +46,21 @@ class MediaCombiner:
         self.output_dir.mkdir(parents=True, exist_ok=True)
     
     @staticmethod
-    def natural_sort_key(s: str) -> List[Tuple[str, int]]:
+    def natural_sort_key(s: str) -> Tuple:
         """Key for natural sorting of strings with numbers.
         
         Args:
             s (str): String to convert to sort key
         
         Returns:
-            List[Tuple[str, int]]: Sort key that handles numbers properly
+            Tuple: Alternating text and integer parts, so numbers
+                compare by value (e.g., part2 before part10)
         """
-        return [(str, int(num)) if num else (txt, 0)
-                for txt, num in re.findall(r'([^0-9]*)([0-9]*)', s)]
+        # split() with a capture group puts the numbers at odd indices
+        return tuple(
+            int(token) if i % 2 else token
+            for i, token in enumerate(_NATSORT_RE.split(s))
+        )
     
     def find_matching_files(self) -> List[Tuple[Path, Path]]:
         """Find matching audio and image files in input directory.
@@ -58,23 +68,26 @@ class MediaCombiner:
         Returns:
             List[Tuple[Path, Path]]: List of (audio_path, image_path) pairs
         """
-        # Get all mp3 and image files
+        # Get all mp3 files in playback order
         audio_files = sorted(
-            [f for f in self.input_dir.glob("*.mp3")],
-            key=lambda x: self.natural_sort_key(x.stem)
-        )
-        image_files = sorted(
-            [f for f in self.input_dir.glob("*.jpg")],
+            self.input_dir.glob("*.mp3"),
             key=lambda x: self.natural_sort_key(x.stem)
         )
         
+        # Index images by base name for constant-time matching; patterns
+        # are applied in reverse so .jpg wins when several formats exist
+        image_files = {
+            img.stem: img
+            for img in chain.from_iterable(
+                self.input_dir.glob(pattern)
+                for pattern in reversed(IMAGE_PATTERNS)
+            )
+        }
+        
         # Match files by their base names
         pairs = []
         for audio in audio_files:
-            matching_image = next(
-                (img for img in image_files if img.stem == audio.stem),
-                None
-            )
+            matching_image = image_files.get(audio.stem)
             if matching_image:
                 pairs.append((audio, matching_image))
             else:
@@ -82,7 +95,7 @@ class MediaCombiner:
         
         return pairs
     
-    def create_clip(self, audio_path: Path, image_path: Path) -> ImageClip:
+    def create_clip(self, audio_path: Path, image_path: Path) -> "ImageClip":
         """Create a video clip from an audio-image pair.
         
         Args:
@@ -92,6 +105,9 @@ class MediaCombiner:
         Returns:
             ImageClip: Video clip with synchronized audio
         """
+        # Imported lazily: moviepy pulls in numpy, imageio and PIL
+        from moviepy.editor import AudioFileClip, ImageClip
+        
         audio = AudioFileClip(str(audio_path))
         image = ImageClip(str(image_path))
         video = image.set_duration(audio.duration)
@@ -114,15 +130,6 @@ class MediaCombiner:
         
         print(f"\n📂 Found {len(pairs)} matching pairs")
         
-        print("\n🎬 Creating video clips...")
-        clips = [
-            self.create_clip(audio, image)
-            for audio, image in tqdm(pairs, desc="Creating clips", unit="clip")
-        ]
-        
-        print("\n🎥 Combining clips into final video...")
-        final_video = concatenate_videoclips(clips)
-        
         # Handle output path
         if output_name:
             # If output_name is a full path, use it directly
@@ -135,18 +142,11 @@ class MediaCombiner:
         else:
             output_path = self.output_dir / "combined_video.mp4"
         
-        print("\n💾 Encoding final video...")
-        final_video.write_videofile(
-            str(output_path),
-            fps=self.config.video["fps"],
-            codec=self.config.video["video_codec"],
-            preset=self.config.video["video_preset"],
+        print("\n🎬 Encoding video...")
+        return render_video(
+            [(image, audio) for audio, image in pairs],
+            output_path,
+            self.config.video,
             audio_codec="aac",  # Use AAC for YouTube compatibility
-            audio_bitrate="320k",  # High quality audio
-            ffmpeg_params=[
-                "-crf", str(self.config.video["video_quality"]),
-                "-pix_fmt", self.config.video["pixel_format"]
-            ]
-        )
-        
-        return output_path 
\ No newline at end of file
+            audio_bitrate="320k"  # High quality audio
+        )
\ No newline at end of file
@@ -0,0 +1,117 @@
+"""Reuse of previously generated outputs.
+
+This module records the request parameters used to generate each output
+file in a sidecar .meta.json file, so reruns can skip paid API calls for
+scenes that already exist and were generated from the same inputs.
+Outputs are written through a temporary file so an interrupted download
+never leaves a partial file at the output path.
+"""
+
+from contextlib import contextmanager
+import hashlib
+import json
+import os
+from pathlib import Path
+import shutil
+from typing import Iterator
+
+
+def params_hash(params: dict) -> str:
+    """Hash request parameters into a stable digest.
+
+    Used both for output sidecars and as the API response cache key.
+
+    Args:
+        params (dict): JSON-serializable request parameters
+
+    Returns:
+        str: Hex digest of the parameters
+    """
+    encoded = json.dumps(params, sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(encoded.encode("utf-8")).hexdigest()
+
+
+def meta_path(output_path: Path) -> Path:
+    """Get the sidecar metadata path for an output file.
+
+    Args:
+        output_path (Path): Path to the generated file
+
+    Returns:
+        Path: Path to its .meta.json sidecar
+    """
+    return output_path.with_name(f"{output_path.name}.meta.json")
+
+
+def is_up_to_date(output_path: Path, params: dict) -> bool:
+    """Check whether an output can be reused for the given parameters.
+
+    Only outputs with a sidecar recording the same parameters are reused;
+    the sidecar is written after the output is complete, so a file
+    without one may be partial or stale.
+
+    Args:
+        output_path (Path): Path to the generated file
+        params (dict): Parameters the output should have been made with
+
+    Returns:
+        bool: True if the existing output can be reused
+    """
+    if not output_path.exists() or output_path.stat().st_size == 0:
+        return False
+
+    try:
+        sidecar = meta_path(output_path).read_text(encoding="utf-8")
+        recorded = json.loads(sidecar)
+    except (OSError, ValueError):
+        return False
+    return recorded.get("hash") == params_hash(params)
+
+
+@contextmanager
+def atomic_output(output_path: Path) -> Iterator[Path]:
+    """Write an output via a temporary file moved into place on success.
+
+    Args:
+        output_path (Path): Final path of the output
+
+    Yields:
+        Path: Temporary path to write the output to
+    """
+    temp_path = output_path.with_name(f".{output_path.name}.part")
+    try:
+        yield temp_path
+        os.replace(temp_path, output_path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+
+def record_params(output_path: Path, params: dict):
+    """Record the parameters an output was generated with.
+
+    Args:
+        output_path (Path): Path to the generated file
+        params (dict): Parameters used to generate it
+    """
+    meta_path(output_path).write_text(
+        json.dumps({"hash": params_hash(params)}),
+        encoding="utf-8"
+    )
+
+
+def copy_output(source_path: Path, output_path: Path, params: dict) -> Path:
+    """Reuse a generated file for another output with the same parameters.
+
+    Args:
+        source_path (Path): Path to the generated file
+        output_path (Path): Path to copy it to
+        params (dict): Parameters the file was generated with
+
+    Returns:
+        Path: The output path
+    """
+    if source_path != output_path:
+        with atomic_output(output_path) as temp_path:
+            shutil.copyfile(source_path, temp_path)
+        record_params(output_path, params)
+    return output_path
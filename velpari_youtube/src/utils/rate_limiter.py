@@ -0,0 +1,69 @@
+"""Client-side rate limiting for API calls.
+
+This module provides a token bucket that throttles requests before they
+are sent, so concurrent batches stay under provider limits instead of
+triggering bursts of 429 responses and long backoffs.
+"""
+
+import asyncio
+from collections import deque
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """Limits requests and tokens per minute over a sliding window.
+
+    Each call to acquire() records a request and its estimated token
+    count. When either limit would be exceeded, acquire() sleeps until the
+    oldest request leaves the window.
+
+    Args:
+        rpm (int): Maximum requests per minute
+        tpm (int, optional): Maximum tokens per minute, or None for no
+            token limit
+        period (float, optional): Window length in seconds
+    """
+
+    def __init__(self, rpm: int, tpm: Optional[int] = None,
+                 period: float = 60.0):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.period = period
+        self._requests = deque()  # (timestamp, tokens) per request
+        self._tokens = 0
+        self._lock = asyncio.Lock()
+
+    def _expire(self, now: float):
+        """Drop requests that have left the window."""
+        while self._requests and now - self._requests[0][0] >= self.period:
+            _, tokens = self._requests.popleft()
+            self._tokens -= tokens
+
+    def _has_capacity(self, tokens: int) -> bool:
+        """Check whether a request of the given size fits in the window."""
+        if not self._requests:
+            # Always admit a request into an empty window, even if it is
+            # larger than the token limit, so it can't wait forever
+            return True
+        if len(self._requests) >= self.rpm:
+            return False
+        return self.tpm is None or self._tokens + tokens <= self.tpm
+
+    async def acquire(self, tokens: int = 0):
+        """Wait until a request of the given size may be sent.
+
+        Args:
+            tokens (int, optional): Estimated tokens used by the request
+        """
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._expire(now)
+                if self._has_capacity(tokens):
+                    break
+                next_free = self._requests[0][0] + self.period
+                await asyncio.sleep(max(0, next_free - now))
+
+            self._requests.append((now, tokens))
+            self._tokens += tokens
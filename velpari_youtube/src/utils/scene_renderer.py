@@ -0,0 +1,230 @@
+"""Scene rendering with ffmpeg.
+
+This module renders each image-audio pair straight to an MP4 scene with
+ffmpeg, then joins the scenes with the concat demuxer using a stream copy,
+so no frames pass through Python and the join needs no re-encode. Scenes
+are independent, so they are encoded in parallel worker processes.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import os
+from pathlib import Path
+import subprocess
+import tempfile
+from typing import List, Tuple
+from tqdm import tqdm
+from src.utils.video_encoder import (
+    FFMPEG_BINARY,
+    encoder_settings,
+    resolve_hwaccel,
+)
+
+
+def run_ffmpeg(args: List[str]):
+    """Run ffmpeg with the given arguments.
+
+    Args:
+        args (List[str]): Arguments following the ffmpeg binary
+
+    Raises:
+        RuntimeError: If ffmpeg exits with an error
+    """
+    result = subprocess.run(
+        [FFMPEG_BINARY, "-y", "-hide_banner", "-loglevel", "error", *args],
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed: {result.stderr.strip()}")
+
+
+def encode_scene(
+    image_path: Path,
+    audio_path: Path,
+    output_path: Path,
+    fps: int,
+    video_args: List[str],
+    audio_args: List[str]
+) -> Path:
+    """Encode a still image with its narration into a single scene.
+
+    Args:
+        image_path (Path): Path to the image file
+        audio_path (Path): Path to the audio file
+        output_path (Path): Path for the scene video
+        fps (int): Frame rate of the scene
+        video_args (List[str]): ffmpeg video codec arguments
+        audio_args (List[str]): ffmpeg audio codec arguments
+
+    Returns:
+        Path: Path to the encoded scene
+    """
+    run_ffmpeg([
+        "-loop", "1",
+        "-framerate", str(fps),
+        "-i", str(image_path),
+        "-i", str(audio_path),
+        *video_args,
+        *audio_args,
+        "-shortest",
+        str(output_path)
+    ])
+    return output_path
+
+
+def scene_filter(video_config: dict) -> str:
+    """Get the filter that fits every scene to the output resolution.
+
+    Stream-copied scenes must share a resolution, so each image is scaled
+    to fit the configured frame and letterboxed to fill it exactly.
+
+    Args:
+        video_config (dict): Video settings from the configuration
+
+    Returns:
+        str: ffmpeg filter graph for the scene's video stream
+    """
+    width, height = video_config["resolution"].split("x")
+    return (
+        f"scale={width}:{height}:force_original_aspect_ratio=decrease,"
+        f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1"
+    )
+
+
+def scene_video_args(video_config: dict, backend: str) -> List[str]:
+    """Get the ffmpeg video arguments for encoding scenes.
+
+    Args:
+        video_config (dict): Video settings from the configuration
+        backend (str): Backend returned by resolve_hwaccel()
+
+    Returns:
+        List[str]: Video codec, quality and filter arguments
+    """
+    codec, params = encoder_settings(video_config, backend)
+    fit = scene_filter(video_config)
+    if "-vf" not in params:
+        return ["-c:v", codec, *params, "-vf", fit]
+
+    # Run the resize ahead of any encoder-specific filters
+    i = params.index("-vf") + 1
+    params = [*params[:i], f"{fit},{params[i]}", *params[i + 1:]]
+    return ["-c:v", codec, *params]
+
+
+def scene_workers(video_config: dict, backend: str) -> int:
+    """Get the number of scenes to encode in parallel.
+
+    Hardware encoders allow only a few concurrent sessions, while
+    software encoders are split across half the cores since each ffmpeg
+    process is itself multithreaded.
+
+    Args:
+        video_config (dict): Video settings from the configuration
+        backend (str): Backend returned by resolve_hwaccel()
+
+    Returns:
+        int: Number of worker processes
+    """
+    if "scene_workers" in video_config:
+        return max(1, video_config["scene_workers"])
+    if backend != "none":
+        return 2
+    return max(1, (os.cpu_count() or 2) // 2)
+
+
+def concat_scenes(scene_paths: List[Path], output_path: Path) -> Path:
+    """Join encoded scenes into one video without re-encoding.
+
+    Args:
+        scene_paths (List[Path]): Scene videos in playback order
+        output_path (Path): Path for the final video
+
+    Returns:
+        Path: Path to the final video
+    """
+    list_path = output_path.with_name(f"{output_path.stem}_concat.txt")
+    with open(list_path, "w") as f:
+        for scene in scene_paths:
+            escaped = str(Path(scene).resolve()).replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+
+    try:
+        run_ffmpeg([
+            "-f", "concat",
+            "-safe", "0",
+            "-i", str(list_path),
+            "-c", "copy",
+            str(output_path)
+        ])
+    finally:
+        list_path.unlink()
+
+    return output_path
+
+
+def render_video(
+    pairs: List[Tuple[Path, Path]],
+    output_path: Path,
+    video_config: dict,
+    audio_codec: str,
+    audio_bitrate: str
+) -> Path:
+    """Render image-audio pairs into a single video.
+
+    Scenes are written to a temporary directory next to the output and
+    removed once the final video has been assembled.
+
+    Args:
+        pairs (List[Tuple[Path, Path]]): (image_path, audio_path) pairs
+        output_path (Path): Path for the final video
+        video_config (dict): Video settings from the configuration
+        audio_codec (str): Audio codec for the video
+        audio_bitrate (str): Audio bitrate for the video
+
+    Returns:
+        Path: Path to the final video
+    """
+    # Resolve the encoder once, so a fallback is only reported once
+    backend = resolve_hwaccel(video_config.get("hwaccel", "none"))
+    video_args = scene_video_args(video_config, backend)
+    workers = scene_workers(video_config, backend)
+    # Stream-copied scenes must share audio parameters, so resample all
+    # narration to the same rate and channel layout
+    audio_args = [
+        "-c:a", audio_codec,
+        "-b:a", audio_bitrate,
+        "-ar", str(video_config["audio_sample_rate"]),
+        "-ac", str(video_config["audio_channels"])
+    ]
+
+    with tempfile.TemporaryDirectory(dir=output_path.parent) as scene_dir, \
+            ProcessPoolExecutor(workers) as executor:
+        futures = [
+            executor.submit(
+                encode_scene,
+                image_path,
+                audio_path,
+                Path(scene_dir) / f"scene_{i}.mp4",
+                video_config["fps"],
+                video_args,
+                audio_args
+            )
+            for i, (image_path, audio_path) in enumerate(pairs)
+        ]
+        try:
+            for future in tqdm(
+                as_completed(futures),
+                total=len(futures),
+                desc="Encoding scenes",
+                unit="scene"
+            ):
+                future.result()
+        except BaseException:
+            # Don't encode the remaining scenes for a video that failed
+            executor.shutdown(cancel_futures=True)
+            raise
+
+        # Join in playback order, not completion order
+        scene_paths = [future.result() for future in futures]
+        return concat_scenes(scene_paths, output_path)
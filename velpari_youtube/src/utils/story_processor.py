@@ -4,8 +4,36 @@ This module handles reading and processing story text files, including
 splitting them into paragraphs for processing.
 """
 
+from functools import lru_cache
 from pathlib import Path
-from src.utils.config import Config
+import re
+from typing import Iterator
+from src.utils.config import get_config
+
+# Blank lines (optionally containing whitespace or \r) between paragraphs
+_PARA_RE = re.compile(r'\n\s*\n')
+
+
+@lru_cache(maxsize=32)
+def _read_cached(path: Path, mtime_ns: int) -> str:
+    """Read a text file, cached by path and modification time."""
+    return path.read_text(encoding='utf-8')
+
+
+def _read_text(path: Path) -> str:
+    """Read a UTF-8 text file, reusing the contents until it changes.
+    
+    Args:
+        path (Path): Path to the file
+    
+    Returns:
+        str: File contents
+    
+    Raises:
+        FileNotFoundError: If the file doesn't exist; missing files are
+            not cached, so a file created later is picked up
+    """
+    return _read_cached(path, path.stat().st_mtime_ns)
 
 
 class StoryProcessor:
@@ -16,10 +44,10 @@ class StoryProcessor:
     """
     
     def __init__(self):
-        self.config = Config()
+        self.config = get_config()
     
     def split_into_paragraphs(self, text: str) -> list[str]:
-        """Split text into paragraphs based on double newlines.
+        """Split text into paragraphs separated by blank lines.
         
         Args:
             text (str): The full story text
@@ -27,7 +55,30 @@ class StoryProcessor:
         Returns:
             list[str]: List of paragraphs
         """
-        return [p.strip() for p in text.split("\n\n") if p.strip()]
+        return list(self.iter_paragraphs(text))
+    
+    def iter_paragraphs(self, text: str) -> Iterator[str]:
+        """Lazily yield paragraphs separated by blank lines.
+        
+        Handles both Unix and Windows line endings and any number of blank
+        lines between paragraphs.
+        
+        Args:
+            text (str): The full story text
+        
+        Yields:
+            str: Each non-empty paragraph, stripped of surrounding whitespace
+        """
+        start = 0
+        for match in _PARA_RE.finditer(text):
+            paragraph = text[start:match.start()].strip()
+            if paragraph:
+                yield paragraph
+            start = match.end()
+        
+        paragraph = text[start:].strip()
+        if paragraph:
+            yield paragraph
     
     def get_chapter_path(self, chapter_number: int) -> Path:
         """Get path to chapter file.
@@ -54,6 +105,9 @@ class StoryProcessor:
     def read_base_prompt(self, chapter_number: int) -> str:
         """Read base prompt for a chapter.
         
+        File contents are cached, so each prompt file is read once until it
+        changes.
+        
         Args:
             chapter_number (int): Chapter number
             
@@ -61,13 +115,17 @@ class StoryProcessor:
             str: Base prompt text, or None if file doesn't exist
         """
         prompt_path = self.get_base_prompt_path(chapter_number)
-        if prompt_path.exists():
-            return prompt_path.read_text().strip()
-        return None
+        try:
+            return _read_text(prompt_path).strip()
+        except FileNotFoundError:
+            return None
     
     def read_chapter(self, chapter_number: int) -> str:
         """Read a specific chapter from file.
         
+        File contents are cached, so each chapter file is read once until
+        it changes.
+        
         Args:
             chapter_number (int): The chapter number to read
         
@@ -83,8 +141,7 @@ class StoryProcessor:
                 f"Chapter {chapter_number} not found at {file_path}"
             )
         
-        with open(file_path, "r") as f:
-            return f.read()
+        return _read_text(file_path)
     
     def get_output_filename(self, chapter_number: int) -> str:
         """Get the output filename for a chapter's video.
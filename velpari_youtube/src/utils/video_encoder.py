@@ -0,0 +1,128 @@
+"""Video encoder selection.
+
+This module picks the ffmpeg video encoder and its quality settings from
+the video configuration, using a hardware encoder (NVENC, VideoToolbox,
+VAAPI or AMF) when one is configured and available.
+"""
+
+from functools import lru_cache
+import subprocess
+from typing import List, Tuple
+
+FFMPEG_BINARY = "ffmpeg"
+
+# Hardware encoders in auto-detection order, with their quality settings
+HWACCEL_ENCODERS = {
+    "nvenc": ("h264_nvenc", [
+        "-preset", "p4", "-tune", "hq", "-rc", "constqp", "-qp", "24"
+    ]),
+    "videotoolbox": ("h264_videotoolbox", ["-q:v", "50"]),
+    "vaapi": ("h264_vaapi", [
+        "-vaapi_device", "/dev/dri/renderD128",
+        "-vf", "format=nv12,hwupload"
+    ]),
+    "amf": ("h264_amf", []),
+}
+
+
+@lru_cache(maxsize=1)
+def available_encoders() -> frozenset:
+    """List the encoders supported by the local ffmpeg build.
+
+    The result is cached, so ffmpeg is only queried once per process.
+
+    Returns:
+        frozenset: Encoder names, or an empty set if ffmpeg can't be run
+    """
+    try:
+        result = subprocess.run(
+            [FFMPEG_BINARY, "-hide_banner", "-encoders"],
+            capture_output=True,
+            text=True,
+            check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return frozenset()
+
+    # Encoder lines look like " V....D libx264   libx264 H.264 ..."
+    encoders = set()
+    for line in result.stdout.splitlines():
+        fields = line.split()
+        if len(fields) >= 2 and len(fields[0]) == 6:
+            encoders.add(fields[1])
+    return frozenset(encoders)
+
+
+def resolve_hwaccel(hwaccel: str) -> str:
+    """Resolve the configured hardware acceleration to a usable backend.
+
+    Args:
+        hwaccel (str): One of none, auto, nvenc, videotoolbox, vaapi, amf
+
+    Returns:
+        str: Backend name from HWACCEL_ENCODERS, or "none" for software
+
+    Raises:
+        ValueError: If hwaccel is not a known backend
+    """
+    if hwaccel == "none":
+        return "none"
+
+    encoders = available_encoders()
+    if hwaccel == "auto":
+        return next(
+            (name for name, (codec, _) in HWACCEL_ENCODERS.items()
+             if codec in encoders),
+            "none"
+        )
+
+    if hwaccel not in HWACCEL_ENCODERS:
+        raise ValueError(f"Unknown video hwaccel setting: {hwaccel}")
+
+    if HWACCEL_ENCODERS[hwaccel][0] not in encoders:
+        print(f"⚠️  Warning: {hwaccel} encoder not available, "
+              "falling back to software encoding")
+        return "none"
+    return hwaccel
+
+
+def encoder_settings(
+    video_config: dict,
+    backend: str
+) -> Tuple[str, List[str]]:
+    """Get the video codec and encoder parameters to use.
+
+    Scenes are a single still image held for the narration, so a long
+    keyframe interval (one per minute) is used; each scene still starts
+    on a keyframe.
+
+    Args:
+        video_config (dict): Video settings from the configuration
+        backend (str): Backend returned by resolve_hwaccel()
+
+    Returns:
+        Tuple[str, List[str]]: Codec name and extra ffmpeg parameters
+    """
+    gop = str(video_config["fps"] * 60)
+    if backend == "none":
+        codec = video_config["video_codec"]
+        params = [
+            "-preset", video_config["video_preset"],
+            "-crf", str(video_config["video_quality"]),
+            "-pix_fmt", video_config["pixel_format"],
+            "-g", gop
+        ]
+        if codec == "libx264":
+            params += [
+                "-tune", "stillimage",
+                "-keyint_min", gop,
+                "-x264-params", "scenecut=0"
+            ]
+        return codec, params
+
+    codec, params = HWACCEL_ENCODERS[backend]
+    params = params + ["-g", gop]
+    if backend == "vaapi":
+        # Frames are uploaded as nv12 surfaces by the hwupload filter
+        return codec, params
+    return codec, params + ["-pix_fmt", video_config["pixel_format"]]